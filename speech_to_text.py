@@ -5,27 +5,39 @@ Triggered by keyboard shortcut, inserts transcribed text at cursor position.
 """
 
 import argparse
+import asyncio
+import collections
+import contextlib
+import functools
+import glob
+import importlib.util
+import multiprocessing
 import os
+import queue
+import selectors
+import signal
 import sys
 import json
-import queue
+import shutil
 import subprocess
 import threading
 import tempfile
 import time
+import unicodedata
 from pathlib import Path
 
-try:
-    import vosk
-except ImportError:
+# vosk and pyaudio are slow to import, so only check they are installed here;
+# SpeechRecognizer imports them in the background (see _import_vosk/_import_pyaudio)
+# while the hotkey listener starts.
+if importlib.util.find_spec("vosk") is None:
     print("Error: vosk not installed. Run: pip install vosk")
     sys.exit(1)
+vosk = None
 
-try:
-    import pyaudio
-except ImportError:
+if importlib.util.find_spec("pyaudio") is None:
     print("Error: pyaudio not installed. Run: pip install pyaudio")
     sys.exit(1)
+pyaudio = None
 
 try:
     from pynput import keyboard
@@ -33,11 +45,45 @@ except ImportError:
     print("Error: pynput not installed. Run: pip install pynput")
     sys.exit(1)
 
+try:
+    import numpy as np
+except ImportError:
+    print("Error: numpy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+# Vosk results are parsed with orjson when available (C, faster than json)
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Grapheme clusters are matched with regex's \X when available
+try:
+    import regex
+except ImportError:
+    regex = None
+
 
 # Global flags from command line
 DAEMON_MODE = False
 
 
+def _import_vosk():
+    """Import vosk on first use."""
+    global vosk
+    if vosk is None:
+        import vosk as vosk_module
+        vosk = vosk_module
+
+
+def _import_pyaudio():
+    """Import pyaudio on first use."""
+    global pyaudio
+    if pyaudio is None:
+        import pyaudio as pyaudio_module
+        pyaudio = pyaudio_module
+
+
 def load_config():
     """Load configuration from external JSON file."""
     # Config file locations (in priority order)
@@ -57,53 +103,127 @@ def load_config():
     return None, None
 
 
+_KEY_BACKSPACE = keyboard.Key.backspace
+_KEY_CTRL = keyboard.Key.ctrl
+
+_MODIFIER_MAP = {
+    "ctrl": keyboard.Key.ctrl,
+    "control": keyboard.Key.ctrl,
+    "alt": keyboard.Key.alt,
+    "shift": keyboard.Key.shift,
+    "super": keyboard.Key.cmd,
+    "meta": keyboard.Key.cmd,
+    "cmd": keyboard.Key.cmd,
+}
+
+_SPECIAL_KEYS = {
+    "space": keyboard.Key.space,
+    "enter": keyboard.Key.enter,
+    "tab": keyboard.Key.tab,
+    "escape": keyboard.Key.esc,
+    "esc": keyboard.Key.esc,
+}
+
+
 def parse_hotkey(hotkey_config):
     """Parse hotkey configuration into pynput key set."""
     if hotkey_config is None:
         # Default: Ctrl+Shift+Space
-        return {keyboard.Key.ctrl, keyboard.Key.shift, keyboard.Key.space}
+        return _parse_hotkey(("ctrl", "shift"), "space")
     
-    keys = set()
-    modifiers = hotkey_config.get("modifiers", [])
+    modifiers = tuple(mod.lower() for mod in hotkey_config.get("modifiers", []))
     key = hotkey_config.get("key", "space")
-    
-    modifier_map = {
-        "ctrl": keyboard.Key.ctrl,
-        "control": keyboard.Key.ctrl,
-        "alt": keyboard.Key.alt,
-        "shift": keyboard.Key.shift,
-        "super": keyboard.Key.cmd,
-        "meta": keyboard.Key.cmd,
-        "cmd": keyboard.Key.cmd,
-    }
-    
-    for mod in modifiers:
-        mod_lower = mod.lower()
-        if mod_lower in modifier_map:
-            keys.add(modifier_map[mod_lower])
+    return _parse_hotkey(modifiers, key.lower())
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_hotkey(modifiers, key):
+    """Resolve lowercased modifier names and key name to a frozenset of pynput keys."""
+    keys = {_MODIFIER_MAP[mod] for mod in modifiers if mod in _MODIFIER_MAP}
     
     # Handle the main key
-    key_lower = key.lower()
-    special_keys = {
-        "space": keyboard.Key.space,
-        "enter": keyboard.Key.enter,
-        "tab": keyboard.Key.tab,
-        "escape": keyboard.Key.esc,
-        "esc": keyboard.Key.esc,
-    }
-    
-    if key_lower in special_keys:
-        keys.add(special_keys[key_lower])
+    if key in _SPECIAL_KEYS:
+        keys.add(_SPECIAL_KEYS[key])
     elif len(key) == 1:
-        keys.add(keyboard.KeyCode.from_char(key.lower()))
+        keys.add(keyboard.KeyCode.from_char(key))
     else:
         # Try as function key (F1-F12)
-        if key_lower.startswith('f') and key_lower[1:].isdigit():
-            fkey = getattr(keyboard.Key, key_lower, None)
+        if key.startswith('f') and key[1:].isdigit():
+            fkey = getattr(keyboard.Key, key, None)
             if fkey:
                 keys.add(fkey)
     
-    return keys
+    return frozenset(keys)
+
+
+# evdev key names for pynput hotkey keys (left and right variants share a bit)
+_EVDEV_KEY_NAMES = {
+    keyboard.Key.ctrl: ("KEY_LEFTCTRL", "KEY_RIGHTCTRL"),
+    keyboard.Key.alt: ("KEY_LEFTALT", "KEY_RIGHTALT"),
+    keyboard.Key.shift: ("KEY_LEFTSHIFT", "KEY_RIGHTSHIFT"),
+    keyboard.Key.cmd: ("KEY_LEFTMETA", "KEY_RIGHTMETA"),
+    keyboard.Key.space: ("KEY_SPACE",),
+    keyboard.Key.enter: ("KEY_ENTER",),
+    keyboard.Key.tab: ("KEY_TAB",),
+    keyboard.Key.esc: ("KEY_ESC",),
+}
+
+
+def evdev_key_names(key):
+    """
+    Return the evdev key names for a pynput hotkey key (empty if unknown).
+    
+    Character keys are not mapped: evdev reports physical keys, and which
+    key types a given character depends on the keyboard layout.
+    """
+    if key in _EVDEV_KEY_NAMES:
+        return _EVDEV_KEY_NAMES[key]
+    name = getattr(key, "name", "")
+    if name.startswith("f") and name[1:].isdigit():
+        return ("KEY_" + name.upper(),)
+    return ()
+
+
+# XDG shortcut trigger names for pynput hotkey keys
+_PORTAL_MODIFIERS = {
+    keyboard.Key.ctrl: "CTRL",
+    keyboard.Key.alt: "ALT",
+    keyboard.Key.shift: "SHIFT",
+    keyboard.Key.cmd: "LOGO",
+}
+
+_PORTAL_KEYS = {
+    keyboard.Key.space: "space",
+    keyboard.Key.enter: "Return",
+    keyboard.Key.tab: "Tab",
+    keyboard.Key.esc: "Escape",
+}
+
+
+def portal_trigger(hotkey):
+    """Format a pynput hotkey as an XDG shortcut trigger, e.g. "CTRL+SHIFT+space"."""
+    modifiers = sorted(_PORTAL_MODIFIERS[key] for key in hotkey if key in _PORTAL_MODIFIERS)
+    keys = []
+    for key in hotkey:
+        if key in _PORTAL_MODIFIERS:
+            continue
+        if key in _PORTAL_KEYS:
+            keys.append(_PORTAL_KEYS[key])
+        elif getattr(key, "char", None):
+            keys.append(key.char)
+        else:
+            keys.append(getattr(key, "name", "").upper())  # F1-F12
+    return "+".join(modifiers + keys)
+
+
+def grapheme_count(text):
+    """Count user-perceived characters in text, i.e. backspaces to delete it."""
+    if text.isascii():
+        return len(text)
+    if regex is not None:
+        return len(regex.findall(r"\X", text))
+    # Without regex, treat combining marks as part of the preceding character
+    return sum(1 for ch in text if not unicodedata.combining(ch))
 
 
 def format_hotkey(hotkey_config):
@@ -117,6 +237,23 @@ def format_hotkey(hotkey_config):
     return "+".join(parts)
 
 
+def parse_partial(raw):
+    """
+    Extract the text from a Vosk PartialResult() string.
+    
+    Partials always have the shape {"partial" : "..."}, so slicing between
+    the quotes avoids a json.loads and a dict per streaming chunk.
+    """
+    i = raw.find('"partial"')
+    if i < 0:
+        return ""
+    start = raw.find('"', i + len('"partial"')) + 1
+    end = raw.rfind('"')
+    if start <= 0 or end < start:
+        return ""
+    return raw[start:end]
+
+
 class Config:
     """Configuration for the speech-to-text app."""
     
@@ -169,6 +306,31 @@ class Config:
         if cls._config:
             return cls._config.get("incremental_typing", True)
         return True
+    
+    @classmethod
+    def get_use_clipboard(cls):
+        if cls._config is None:
+            cls.load()
+        if cls._config:
+            return cls._config.get("use_clipboard", False)
+        return False
+
+    @classmethod
+    def get_engine(cls):
+        """Recognition engine: "vosk" (default) or "whisper" (faster-whisper)."""
+        if cls._config is None:
+            cls.load()
+        if cls._config:
+            return cls._config.get("engine", "vosk")
+        return "vosk"
+    
+    @classmethod
+    def get_whisper_model(cls):
+        if cls._config is None:
+            cls.load()
+        if cls._config:
+            return cls._config.get("whisper_model", "small")
+        return "small"
 
     # Vosk model path - will be downloaded to ~/.local/share/vosk-models
     @classmethod
@@ -182,6 +344,9 @@ class Config:
     # Audio settings
     SAMPLE_RATE = 16000
     CHUNK_SIZE = 4000  # Smaller chunks for more responsive streaming
+    MAX_RECORD_SECONDS = 30  # Preallocated recording buffer length (grows if exceeded)
+    BATCH_CHUNKS = 4  # Chunks per AcceptWaveform call in batch mode
+    BACKLOG_SECONDS = 2.0  # Queued audio above which streaming skips partials
     
     # Streaming mode settings
     @classmethod
@@ -195,6 +360,40 @@ class Config:
     STREAMING_MODE = True  # Default, will be overridden
     STREAMING_INTERVAL = 0.1  # Seconds between text updates
     
+    @classmethod
+    def get_streaming_interval(cls):
+        if cls._config is None:
+            cls.load()
+        if cls._config:
+            return cls._config.get("streaming_interval", cls.STREAMING_INTERVAL)
+        return cls.STREAMING_INTERVAL
+    
+    @classmethod
+    def get_inference_process(cls):
+        if cls._config is None:
+            cls.load()
+        if cls._config:
+            return cls._config.get("inference_process", False)
+        return False
+    
+    @classmethod
+    def get_vad(cls):
+        if cls._config is None:
+            cls.load()
+        if cls._config:
+            return cls._config.get("vad", False)
+        return False
+    
+    # Voice activity detection (Silero VAD) settings
+    VAD_FRAME_SIZE = 512  # Samples per VAD frame (32 ms, as Silero requires at 16 kHz)
+    VAD_THRESHOLD = 0.5  # Speech probability above which a frame counts as speech
+    VAD_SILENCE_SECONDS = 0.5  # Silence that ends an utterance
+    # Energy VAD, used when silero-vad is not installed or "vad" is "energy"
+    ENERGY_VAD_THRESHOLD = 500  # RMS of 16-bit samples above which a chunk counts as speech
+    ENERGY_VAD_SILENCE_SECONDS = 0.7  # Longer hangover, as energy misses quiet word endings
+    
+    EVDEV_RESCAN_SECONDS = 2.0  # How often to look for newly attached keyboards
+    
     @classmethod
     def notifications_enabled(cls):
         if cls._config is None:
@@ -203,19 +402,9 @@ class Config:
             return cls._config.get("notifications", True)
         return True
     
-    # Display server detection
-    @staticmethod
-    def get_display_server():
-        """Detect X11 or Wayland."""
-        session_type = os.environ.get("XDG_SESSION_TYPE", "x11")
-        return session_type.lower()
-    
-    @staticmethod
-    def get_typing_tool():
-        """Get the appropriate tool for typing text."""
-        if Config.get_display_server() == "wayland":
-            return "ydotool"
-        return "xdotool"
+    # Display server (X11 or Wayland) and its typing tool, detected once at import
+    DISPLAY_SERVER = os.environ.get("XDG_SESSION_TYPE", "x11").lower()
+    TYPING_TOOL = "ydotool" if DISPLAY_SERVER == "wayland" else "xdotool"
 
 
 class Notifier:
@@ -234,25 +423,272 @@ class Notifier:
             print(f"[{title}] {message}")
 
 
+class X11Clipboard:
+    """
+    Own the X11 CLIPBOARD selection in-process using python-xlib.
+    
+    A background thread answers SelectionRequest events with the latest
+    text, so copying is an in-memory update plus one SetSelectionOwner
+    request instead of spawning xclip.
+    """
+    
+    def __init__(self):
+        import Xlib.threaded  # Makes the display connection thread-safe
+        from Xlib import X, Xatom, display
+        
+        self._X = X
+        self.display = display.Display()
+        self.window = self.display.screen().root.create_window(
+            0, 0, 1, 1, 0, X.CopyFromParent
+        )
+        self.clipboard = self.display.intern_atom("CLIPBOARD")
+        self.targets = self.display.intern_atom("TARGETS")
+        self.text_targets = (
+            self.display.intern_atom("UTF8_STRING"),
+            self.display.intern_atom("TEXT"),
+            Xatom.STRING,
+        )
+        self._atom_type = Xatom.ATOM
+        self._data = b""
+        threading.Thread(target=self._serve, daemon=True).start()
+    
+    def copy(self, text: str):
+        """Make text the clipboard contents."""
+        self._data = text.encode()
+        self.window.set_selection_owner(self.clipboard, self._X.CurrentTime)
+        # Round trip rather than flush: once sync() returns the server has
+        # processed the ownership change, so a paste keystroke sent right
+        # after (over another connection) can never see the old owner
+        self.display.sync()
+    
+    def _serve(self):
+        """Answer clipboard requests from other clients."""
+        from Xlib.protocol import event as xevent
+        
+        while True:
+            request = self.display.next_event()
+            if request.type != self._X.SelectionRequest:
+                continue
+            
+            prop = request.property or request.target
+            if request.target == self.targets:
+                request.requestor.change_property(
+                    prop, self._atom_type, 32, [self.targets, *self.text_targets]
+                )
+            elif request.target in self.text_targets:
+                request.requestor.change_property(prop, request.target, 8, self._data)
+            else:
+                prop = self._X.NONE  # Unsupported target
+            
+            notify = xevent.SelectionNotify(
+                time=request.time,
+                requestor=request.requestor,
+                selection=request.selection,
+                target=request.target,
+                property=prop,
+            )
+            request.requestor.send_event(notify)
+            self.display.flush()
+
+
+class X11Keyboard:
+    """
+    Send key events through the XTEST extension using python-xlib.
+    
+    The events for a whole string are queued on one connection and sent
+    with a single sync, rather than a round trip per key (pynput) or a
+    process spawn per call (xdotool).
+    """
+    
+    # Shift, Control, Mod1 (Alt) and Mod4 (Super) bits of the pointer state
+    HELD_MODIFIERS = 0x1 | 0x4 | 0x8 | 0x40
+    LOCK_MASK = 0x2  # Caps Lock, which would invert the case of typed letters
+    GROUP_SHIFT = 13  # Bits 13-14 of the state hold the active XKB group
+    
+    def __init__(self):
+        from Xlib import X, XK, display
+        from Xlib.ext import xtest
+        
+        self._X = X
+        self._fake_input = xtest.fake_input
+        self.display = display.Display()
+        if not self.display.has_extension("XTEST"):
+            raise RuntimeError("XTEST extension not available")
+        self._root = self.display.screen().root
+        self._XK = XK
+        self._shift = None  # Shift_L keycode, looked up per call as the keymap may change
+        self._special_keysyms = {"\n": XK.XK_Return, "\t": XK.XK_Tab}
+    
+    def _key_for(self, char):
+        """Return (keycode, shifted) typing char, or None if no key does."""
+        keysym = self._special_keysyms.get(char)
+        if keysym is None:
+            # Latin-1 keysyms equal the code point; the rest are 0x01000000 + it
+            code = ord(char)
+            keysym = code if code < 0x100 else 0x01000000 | code
+        # Only plain and Shift levels; AltGr levels need more than one modifier
+        keys = [(index, keycode) for keycode, index in self.display.keysym_to_keycodes(keysym) if index < 2]
+        if not keys:
+            return None
+        index, keycode = min(keys)
+        return keycode, index == 1
+    
+    def _state(self):
+        """Return (modifier state mask, active XKB group) in one round trip."""
+        mask = self._root.query_pointer().mask
+        return mask, (mask >> self.GROUP_SHIFT) & 3
+    
+    def _refresh_keymap(self):
+        """
+        Apply keymap changes (e.g. setxkbmap) before looking up keycodes.
+        
+        Nothing else reads this connection, so drain its pending events
+        here; MappingNotify updates python-xlib's cached keymap.
+        """
+        while self.display.pending_events():
+            event = self.display.next_event()
+            if event.type == self._X.MappingNotify:
+                self.display.refresh_keyboard_mapping(event)
+    
+    def _tap(self, keycode, shifted=False):
+        """Queue a press and release of keycode."""
+        if shifted:
+            self._fake_input(self.display, self._X.KeyPress, self._shift)
+        self._fake_input(self.display, self._X.KeyPress, keycode)
+        self._fake_input(self.display, self._X.KeyRelease, keycode)
+        if shifted:
+            self._fake_input(self.display, self._X.KeyRelease, self._shift)
+    
+    def type(self, text: str) -> bool:
+        """
+        Type text.
+        
+        Returns False without sending anything if a modifier or Caps Lock is
+        on, a layout other than the first XKB group is active (the keycodes
+        looked up are for group 1), or a character is not on the keymap;
+        xdotool handles all of these.
+        """
+        self._refresh_keymap()
+        keys = [self._key_for(char) for char in text]
+        if None in keys:
+            return False
+        mask, group = self._state()
+        if mask & (self.HELD_MODIFIERS | self.LOCK_MASK) or group:
+            return False
+        self._shift = self.display.keysym_to_keycode(self._XK.XK_Shift_L)
+        for keycode, shifted in keys:
+            self._tap(keycode, shifted)
+        self.display.sync()
+        return True
+    
+    def backspace(self, count: int) -> bool:
+        """Press BackSpace count times; returns False if a modifier is held."""
+        mask, _ = self._state()
+        if mask & self.HELD_MODIFIERS:
+            return False
+        self._refresh_keymap()
+        backspace = self.display.keysym_to_keycode(self._XK.XK_BackSpace)
+        for _ in range(count):
+            self._tap(backspace)
+        self.display.sync()
+        return True
+
+
 class TextTyper:
-    """Type text at cursor position using clipboard paste."""
+    """Type text at cursor position using xdotool/ydotool or clipboard paste."""
     
     def __init__(self):
-        self.display_server = Config.get_display_server()
+        self.display_server = Config.DISPLAY_SERVER
+        self.use_clipboard = Config.get_use_clipboard()
+        if self.display_server == "wayland":
+            self._type_cmd = ["ydotool", "type", "--key-delay", "0", "--key-hold", "0", "--file", "-"]
+        else:
+            # Release any still-held hotkey modifiers so they don't alter the typed keys
+            self._type_cmd = ["xdotool", "type", "--clearmodifiers", "--delay", "0", "--file", "-"]
+        if self.display_server == "wayland":
+            self._clipboard_cmd = ["wl-copy"]
+        else:
+            self._clipboard_cmd = ["xclip", "-selection", "clipboard"]
+        self._clipboard = None
+        if self.use_clipboard and self.display_server != "wayland":
+            try:
+                self._clipboard = X11Clipboard()
+            except Exception:
+                pass  # python-xlib missing or no X display: use xclip
+        self._xkeyboard = None
+        if self.display_server != "wayland":
+            try:
+                self._xkeyboard = X11Keyboard()
+            except Exception:
+                pass  # python-xlib or XTEST missing: use xdotool and pynput
         self._check_tools()
-        self._last_partial_len = 0  # Track length of last partial text typed
-        self._kb = None
+        self._last_partial = ""  # Text of the current phrase on screen
+        self._committed = ""  # Whole words locked in on screen, with trailing space
+        self._committed_words = 0  # Number of words in _committed
+        self._partial_history = collections.deque(maxlen=2)  # Recent partials
+        self._kb = keyboard.Controller()
+        # Ctrl+V as (action, key) pairs, resolved once
+        self._paste_seq = (
+            (self._kb.press, _KEY_CTRL),
+            (self._kb.press, 'v'),
+            (self._kb.release, 'v'),
+            (self._kb.release, _KEY_CTRL),
+        )
+        # Typing runs on its own thread so the recognition loop never waits
+        # on X/Wayland IPC. Jobs are (kind, text), kind being "partial",
+        # "final", "text" or "reset".
+        self._jobs = collections.deque()
+        self._jobs_event = threading.Event()
+        threading.Thread(target=self._type_worker, daemon=True).start()
+    
+    def _submit(self, kind: str, text: str = ""):
+        """Queue a typing job for the worker thread."""
+        self._jobs.append((kind, text))
+        self._jobs_event.set()
     
-    def _get_keyboard(self):
-        """Get keyboard controller lazily."""
-        if self._kb is None:
-            from pynput.keyboard import Controller
-            self._kb = Controller()
-        return self._kb
+    def _type_worker(self):
+        """
+        Run queued typing jobs in order.
+        
+        Whatever queued up while the previous job was typing is taken at
+        once, and a partial directly followed by another partial or a final
+        is dropped, since that result replaces it on screen anyway.
+        """
+        while True:
+            while not self._jobs:
+                self._jobs_event.wait()
+                self._jobs_event.clear()
+            batch = []
+            while self._jobs:
+                batch.append(self._jobs.popleft())
+            
+            next_kinds = [kind for kind, _ in batch[1:]] + [None]
+            for (kind, text), next_kind in zip(batch, next_kinds):
+                if kind == "partial" and next_kind in ("partial", "final"):
+                    continue
+                try:
+                    if kind == "text":
+                        self._type_text(text)
+                    elif kind == "reset":
+                        self._reset_incremental()
+                    else:
+                        self._type_incremental(text, kind == "final")
+                except Exception as e:
+                    print(f"Typing error: {e}")
     
     def _check_tools(self):
         """Verify required tools are available."""
-        if self.display_server == "wayland":
+        if not self.use_clipboard:
+            tool = Config.TYPING_TOOL
+            if shutil.which(tool) is None:
+                Notifier.send(
+                    "Speech-to-Text Error",
+                    f"{tool} not found. Install with: sudo pacman -S {tool}",
+                    "critical"
+                )
+                print(f"Error: {tool} not installed. Run: sudo pacman -S {tool}")
+                sys.exit(1)
+        elif self.display_server == "wayland":
             # Check for wl-copy (from wl-clipboard)
             try:
                 subprocess.run(["wl-copy", "--version"], capture_output=True, check=False)
@@ -264,7 +700,7 @@ class TextTyper:
                 )
                 print("Error: wl-clipboard not installed. Run: sudo pacman -S wl-clipboard")
                 sys.exit(1)
-        else:
+        elif self._clipboard is None:
             # Check for xclip for X11
             try:
                 subprocess.run(["xclip", "-version"], capture_output=True, check=False)
@@ -279,77 +715,338 @@ class TextTyper:
     
     def _copy_to_clipboard(self, text: str):
         """Copy text to system clipboard."""
-        if self.display_server == "wayland":
-            proc = subprocess.Popen(["wl-copy"], stdin=subprocess.PIPE)
-            proc.communicate(input=text.encode())
+        if self._clipboard is not None:
+            self._clipboard.copy(text)
+            return
+        proc = subprocess.Popen(self._clipboard_cmd, stdin=subprocess.PIPE)
+        proc.communicate(input=text.encode())
+    
+    def _type_direct(self, text: str):
+        """Type text directly with ydotool/xdotool, bypassing the clipboard."""
+        if self._xkeyboard is not None and self._xkeyboard.type(text):
+            return
+        # Text goes over stdin, keeping dictation out of the process list
+        subprocess.run(self._type_cmd, input=text.encode(), check=False)
+    
+    def _insert(self, text: str):
+        """
+        Insert text at the cursor.
+        
+        Types directly by default; with "use_clipboard" enabled, copies the
+        text and pastes it. _copy_to_clipboard only returns once the helper
+        has exited and owns the selection, so no settle delay is needed.
+        """
+        if self.use_clipboard:
+            self._copy_to_clipboard(text)
+            self._paste()
         else:
-            proc = subprocess.Popen(
-                ["xclip", "-selection", "clipboard"],
-                stdin=subprocess.PIPE
-            )
-            proc.communicate(input=text.encode())
+            self._type_direct(text)
     
     def _send_backspaces(self, count: int):
         """Send backspace keys to delete characters."""
         if count <= 0:
             return
-        from pynput.keyboard import Key
-        kb = self._get_keyboard()
-        for _ in range(count):
-            kb.press(Key.backspace)
-            kb.release(Key.backspace)
-            time.sleep(0.005)  # Small delay between backspaces
+        modifier_held = False
+        if self._xkeyboard is not None:
+            if self._xkeyboard.backspace(count):
+                return
+            modifier_held = True  # The only reason XTEST declines
+        if count == 1 and not modifier_held and self.display_server != "wayland":
+            # A single key is cheaper through pynput than spawning a process;
+            # not on Wayland, where pynput only reaches XWayland windows
+            self._kb.press(_KEY_BACKSPACE)
+            self._kb.release(_KEY_BACKSPACE)
+            return
+        if self.display_server == "wayland":
+            # 14 is the evdev keycode for BackSpace (14:1 press, 14:0 release)
+            cmd = ["ydotool", "key", "--key-delay", "0"] + ["14:1", "14:0"] * count
+        else:
+            # Release held hotkey modifiers so this isn't Ctrl+BackSpace
+            cmd = ["xdotool", "key", "--clearmodifiers", "--repeat", str(count), "--delay", "0", "BackSpace"]
+        try:
+            subprocess.run(cmd, check=False)
+        except FileNotFoundError:
+            # Typing tool not installed (clipboard mode): press keys one by one
+            for _ in range(count):
+                self._kb.press(_KEY_BACKSPACE)
+                self._kb.release(_KEY_BACKSPACE)
     
     def _paste(self):
         """Simulate Ctrl+V paste."""
-        from pynput.keyboard import Key
-        kb = self._get_keyboard()
-        kb.press(Key.ctrl)
-        kb.press('v')
-        kb.release('v')
-        kb.release(Key.ctrl)
+        for action, key in self._paste_seq:
+            action(key)
     
     def type_text(self, text: str):
-        """Type text at the current cursor position using clipboard paste."""
+        """Queue text to be typed at the current cursor position."""
+        self._submit("text", text)
+    
+    def type_incremental(self, new_text: str, is_final: bool = False):
+        """Queue a partial or final result for incremental typing."""
+        self._submit("final" if is_final else "partial", new_text)
+    
+    def reset_incremental(self):
+        """Queue a reset of the incremental typing state."""
+        self._submit("reset")
+    
+    def _type_text(self, text: str):
+        """Type text at the current cursor position."""
         if not text.strip():
             return
         
-        self._copy_to_clipboard(text)
-        time.sleep(0.05)
-        self._paste()
-        self._last_partial_len = 0  # Reset for next session
+        self._insert(text)
+        self._reset_incremental()  # Reset for next session
     
-    def type_incremental(self, new_text: str, is_final: bool = False):
+    def _type_incremental(self, new_text: str, is_final: bool = False):
         """
         Type text incrementally, updating previous partial text.
         
-        For partial results: backspace previous text and type new text.
+        Follows LocalAgreement-2: whole words shared by the last two partials
+        are committed and never erased again, even if Vosk later revises them.
+        
+        For partial results: update the uncommitted part of the phrase.
         For final results: commit the text (no more backspacing this segment).
         """
-        # Delete the previous partial text
-        if self._last_partial_len > 0:
-            self._send_backspaces(self._last_partial_len)
+        # Splice by words, not characters: the committed words stay as typed
+        # and the hypothesis supplies everything after them, so a revision
+        # of a committed word can never leave a fragment behind
+        rest = " ".join(new_text.split()[self._committed_words:])
+        shown = (self._committed + rest).rstrip(" ")
+        if is_final:
+            # Insert the text with its trailing space in one go and reset state
+            self._show(shown + " ")
+            self._reset_incremental()
+            return
+        
+        self._show(shown)
+        
+        self._partial_history.append(new_text)
+        if len(self._partial_history) == self._partial_history.maxlen:
+            stable = os.path.commonprefix(list(self._partial_history))
+            stable_words = stable[:stable.rfind(" ") + 1].split()  # Only lock in whole words
+            if len(stable_words) > self._committed_words:
+                self._committed_words = len(stable_words)
+                self._committed = " ".join(shown.split()[:self._committed_words]) + " "
+    
+    def _show(self, text: str):
+        """
+        Replace the current phrase on screen with text.
         
-        if new_text:
-            # Copy and paste the new text
-            self._copy_to_clipboard(new_text)
-            time.sleep(0.03)
-            self._paste()
+        Only the characters after the common prefix of the old and new
+        phrase are backspaced and retyped, so a growing partial like
+        "hello wor" -> "hello world" costs no backspaces at all.
+        """
+        old = self._last_partial
+        tail = text[len(old):]
+        if text.startswith(old) and not (tail and unicodedata.combining(tail[0])):
+            # Common case: Vosk only appended, so skip the diff and type the tail
+            if tail:
+                self._insert(tail)
+            self._last_partial = text
+            return
         
-        if is_final:
-            # Add a space after final text and reset counter
-            time.sleep(0.03)
-            self._copy_to_clipboard(" ")
-            time.sleep(0.02)
-            self._paste()
-            self._last_partial_len = 0
-        else:
-            # Track length for next backspace operation
-            self._last_partial_len = len(new_text)
+        common = len(os.path.commonprefix([old, text]))
+        # Back up to a character boundary so no base letter loses its accents
+        while common and any(common < len(s) and unicodedata.combining(s[common]) for s in (old, text)):
+            common -= 1
+        self._send_backspaces(grapheme_count(old[common:]))
+        if len(text) > common:
+            self._insert(text[common:])
+        self._last_partial = text
     
-    def reset_incremental(self):
+    def _reset_incremental(self):
         """Reset incremental typing state."""
-        self._last_partial_len = 0
+        self._last_partial = ""
+        self._committed = ""
+        self._committed_words = 0
+        self._partial_history.clear()
+
+
+class VoskStream:
+    """
+    Decode one audio stream with a Vosk recognizer.
+    
+    Results are reported through callback(text, is_final), the same contract
+    as SpeechRecognizer.stream_and_transcribe.
+    """
+    
+    def __init__(self, recognizer, callback):
+        self.recognizer = recognizer
+        self.callback = callback
+        self.last_partial_raw = ""  # Last PartialResult() string, unparsed
+        # Raw C entry point taking int16 samples, if this vosk build exposes it
+        self._accept_waveform_s = getattr(
+            getattr(vosk, "_c", None), "vosk_recognizer_accept_waveform_s", None
+        )
+    
+    def _accept_pcm(self, pcm) -> bool:
+        """
+        Feed 16-bit PCM to the recognizer.
+        
+        Buffers other than bytes (bytearray, memoryview, numpy int16 arrays)
+        are handed to Vosk's vosk_recognizer_accept_waveform_s as a view, so
+        they are never copied into an intermediate bytes object.
+        """
+        if isinstance(pcm, bytes) or self._accept_waveform_s is None:
+            return self.recognizer.AcceptWaveform(bytes(pcm))
+        
+        samples = vosk._ffi.from_buffer("short[]", pcm)
+        res = self._accept_waveform_s(self.recognizer._handle, samples, len(samples))
+        if res < 0:
+            raise Exception("Failed to process waveform")
+        return res
+    
+    def accept(self, data, partials=True):
+        """
+        Feed a chunk of 16-bit PCM and report any new result.
+        
+        With partials=False the partial result is not fetched, which lets
+        a recognizer that has fallen behind real time catch up.
+        """
+        if self._accept_pcm(data):
+            # Got a final result for a phrase
+            result = json_loads(self.recognizer.Result())
+            # The recognizer starts a new phrase, so the next partial is new
+            self.last_partial_raw = ""
+            text = result.get("text", "")
+            if text:
+                self.callback(text, is_final=True)
+        elif partials:
+            # Got a partial result; only parse it if it changed. A plain
+            # string compare is as cheap as hashing: PartialResult() returns
+            # a new str each call, so its hash is never cached.
+            raw = self.recognizer.PartialResult()
+            if raw != self.last_partial_raw:
+                self.last_partial_raw = raw
+                text = parse_partial(raw)
+                if text:
+                    self.callback(text, is_final=False)
+    
+    def flush(self):
+        """End the current utterance and report its final text."""
+        result = json_loads(self.recognizer.FinalResult())
+        self.recognizer.Reset()
+        self.last_partial_raw = ""
+        text = result.get("text", "")
+        if text:
+            self.callback(text, is_final=True)
+    
+    def finish(self):
+        """End the stream, reporting any remaining final text."""
+        self.flush()
+
+
+def warm_up_recognizer(recognizer, sample_rate):
+    """
+    Decode one second of silence, then Reset().
+    
+    The first AcceptWaveform pays one-off setup costs; paying them at
+    startup keeps them off the first real utterance.
+    """
+    recognizer.AcceptWaveform(bytes(sample_rate * 2))  # 1s of 16-bit silence
+    recognizer.Reset()
+
+
+class VoskWorker(multiprocessing.get_context("spawn").Process):
+    """
+    Run Vosk recognition in a child process.
+    
+    audio_q carries (pcm, partials) tuples of 16-bit PCM and whether partial
+    results are wanted, FLUSH to end the current utterance, or None to end
+    the session. result_q carries (text, is_final) tuples
+    and None after each session. The first message on result_q is None once
+    the model is loaded, or an error string.
+    """
+    
+    FLUSH = "flush"
+    
+    def __init__(self, model_path, sample_rate):
+        super().__init__(daemon=True)
+        self.model_path = str(model_path)
+        self.sample_rate = sample_rate
+        ctx = multiprocessing.get_context("spawn")
+        self.audio_q = ctx.Queue()
+        self.result_q = ctx.Queue()
+        self.backlog_limit = int(Config.BACKLOG_SECONDS * sample_rate / Config.CHUNK_SIZE)
+    
+    def _send_result(self, text, is_final):
+        self.result_q.put((text, is_final))
+    
+    def get_result(self):
+        """Wait for the next message on result_q, raising if the process died."""
+        while True:
+            try:
+                return self.result_q.get(timeout=1.0)
+            except queue.Empty:
+                if not self.is_alive():
+                    raise RuntimeError(f"inference process exited with code {self.exitcode}")
+    
+    def run(self):
+        # Ctrl+C is handled by the parent, which terminates the worker
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        try:
+            _import_vosk()
+            vosk.SetLogLevel(-1)  # Suppress Vosk logs
+            model = vosk.Model(self.model_path)
+            recognizer = vosk.KaldiRecognizer(model, self.sample_rate)
+            warm_up_recognizer(recognizer, self.sample_rate)
+        except Exception as e:
+            self.result_q.put(str(e))
+            return
+        self.result_q.put(None)  # Ready
+        
+        stream = VoskStream(recognizer, self._send_result)
+        while True:
+            item = self.audio_q.get()
+            if isinstance(item, tuple):
+                pcm, partials = item
+                # Skip partials while behind real time
+                stream.accept(pcm, partials=partials and self.audio_q.qsize() < self.backlog_limit)
+            elif item is None:
+                stream.finish()
+                self.result_q.put(None)  # End of session
+            else:
+                stream.flush()
+
+
+class WorkerStream:
+    """VoskStream counterpart that decodes in a VoskWorker process."""
+    
+    def __init__(self, worker, callback):
+        self.worker = worker
+        self.callback = callback
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+    
+    def _dispatch(self):
+        """Deliver results from the worker to the callback."""
+        while True:
+            try:
+                result = self.worker.get_result()
+            except RuntimeError as e:
+                print(f"Recognition error: {e}")
+                break
+            if result is None:
+                break
+            text, is_final = result
+            self.callback(text, is_final=is_final)
+    
+    def accept(self, data, partials=True):
+        """
+        Send a chunk of 16-bit PCM to the worker.
+        
+        With partials=False the worker does not fetch partial results; it
+        also skips them on its own while behind real time.
+        """
+        self.worker.audio_q.put((bytes(data), partials))
+    
+    def flush(self):
+        """End the current utterance."""
+        self.worker.audio_q.put(VoskWorker.FLUSH)
+    
+    def finish(self):
+        """End the stream and wait for its remaining results."""
+        self.worker.audio_q.put(None)
+        self._dispatcher.join()
 
 
 class SpeechRecognizer:
@@ -358,14 +1055,33 @@ class SpeechRecognizer:
     def __init__(self):
         self.model = None
         self.recognizer = None
+        self.worker = None
+        self.vad = None  # Silero model
+        self.vad_mode = None  # "silero", "energy", or None when VAD is off
+        self._vad_buf = np.empty(Config.CHUNK_SIZE, dtype=np.float32)  # Reused per chunk
+        self._vad_rest = 0  # Samples short of a Silero frame, kept at the front of _vad_buf
         self.audio = None
         self.stream = None
         self.is_recording = False
-        self.audio_queue = queue.Queue()
-        self._load_model()
+        # Set by request_stop(); checked once the model has loaded so a stop
+        # pressed while waiting for it cancels the session before it starts
+        self.stop_requested = threading.Event()
+        self._session_lock = threading.Lock()
+        # Single producer (PortAudio callback) / single consumer (recognition
+        # loop): deque append/popleft are atomic, the event wakes the consumer.
+        self.audio_queue = collections.deque()
+        self._audio_event = threading.Event()
+        self._overflows = 0  # Callbacks PortAudio flagged as input overflow
+        
+        # Load the model and audio backend off the main thread so the hotkey
+        # listener starts immediately; recording waits on _model_ready.
+        self._model_ready = threading.Event()
+        self._model_error = None
+        self._check_model()
+        threading.Thread(target=self._load_in_background, daemon=True).start()
     
-    def _load_model(self):
-        """Load the Vosk model."""
+    def _check_model(self):
+        """Exit early if the Vosk model is missing."""
         model_path = Config.MODEL_PATH
         
         if not model_path.exists():
@@ -377,34 +1093,298 @@ class SpeechRecognizer:
             print(f"Error: Vosk model not found at {model_path}")
             print("Please run the install.sh script to download the model.")
             sys.exit(1)
+    
+    def _load_in_background(self):
+        """Load the model, PyAudio and the input stream, then signal _model_ready."""
+        try:
+            self._load_model()
+            self._init_audio()
+            try:
+                self.stream = self._create_stream()
+            except Exception:
+                pass  # Retried, with a notification, on the first recording
+        except Exception as e:
+            self._model_error = e
+            Notifier.send("Speech-to-Text Error", f"Failed to load model: {e}", "critical")
+            print(f"Error: failed to load model: {e}")
+        finally:
+            self._model_ready.set()
+    
+    def _wait_for_model(self) -> bool:
+        """Block until the model has loaded; return False if loading failed."""
+        if not self._model_ready.is_set():
+            print("Waiting for model to load...")
+            self._model_ready.wait()
+        return self._model_error is None
+    
+    def _load_model(self):
+        """Load the Vosk model, in a worker process if configured."""
+        if Config.get_inference_process() and (os.cpu_count() or 1) > 1:
+            # Keep inference off this interpreter so the hotkey listener and
+            # typing never contend with it
+            self.worker = VoskWorker(Config.MODEL_PATH, Config.SAMPLE_RATE)
+            self.worker.start()
+            error = self.worker.get_result()
+            if error:
+                raise RuntimeError(error)
+        else:
+            _import_vosk()
+            vosk.SetLogLevel(-1)  # Suppress Vosk logs
+            self.model = vosk.Model(str(Config.MODEL_PATH))
+            # Created once and Reset() after each utterance rather than rebuilt
+            self.recognizer = vosk.KaldiRecognizer(self.model, Config.SAMPLE_RATE)
+            warm_up_recognizer(self.recognizer, Config.SAMPLE_RATE)
         
-        vosk.SetLogLevel(-1)  # Suppress Vosk logs
-        self.model = vosk.Model(str(model_path))
-        self.recognizer = vosk.KaldiRecognizer(self.model, Config.SAMPLE_RATE)
+        vad = Config.get_vad()
+        if vad == "energy":
+            self.vad_mode = "energy"
+        elif vad:
+            self.vad = self._load_vad()
+            self.vad_mode = "silero" if self.vad is not None else "energy"
+    
+    def _open_decoder(self, callback):
+        """Return a VoskStream, or a WorkerStream when running a worker process."""
+        if self.worker is not None:
+            return WorkerStream(self.worker, callback)
+        return VoskStream(self.recognizer, callback)
+    
+    def _open_final_decoder(self):
+        """Return a decoder that only collects final texts, and the list it fills."""
+        texts = []
+        
+        def collect(text, is_final):
+            if is_final:
+                texts.append(text)
+        
+        return self._open_decoder(collect), texts
+    
+    def _load_vad(self):
+        """Load the Silero VAD model, or return None if it is not installed."""
+        try:
+            from silero_vad import load_silero_vad
+        except ImportError:
+            print("Warning: silero-vad not installed, using energy VAD. Run: pip install silero-vad")
+            return None
+        return load_silero_vad()
+    
+    def _is_speech(self, pcm) -> bool:
+        """
+        Return True if any VAD frame in the chunk is likely speech.
+        
+        pcm is an int16 sample array; it is converted into a float32 buffer
+        reused across chunks rather than a new array per chunk. Silero only
+        takes whole frames, so samples past the last full frame are carried
+        over and run at the start of the next chunk.
+        """
+        rest = self._vad_rest if self.vad_mode == "silero" else 0
+        total = rest + len(pcm)
+        if total > len(self._vad_buf):
+            buf = np.empty(total, dtype=np.float32)
+            buf[:rest] = self._vad_buf[:rest]
+            self._vad_buf = buf
+        samples = self._vad_buf[:total]
+        np.copyto(samples[rest:], pcm)
+        
+        if self.vad_mode == "energy":
+            rms = np.sqrt(np.dot(samples, samples) / max(len(samples), 1))
+            return rms >= Config.ENERGY_VAD_THRESHOLD
+        
+        import torch
+        
+        samples[rest:] *= 1 / 32768.0
+        frame = Config.VAD_FRAME_SIZE
+        used = total - total % frame
+        speech = False
+        # Run every frame, not just until the first hit, to keep the VAD state continuous
+        for start in range(0, used, frame):
+            prob = self.vad(torch.from_numpy(samples[start:start + frame]), Config.SAMPLE_RATE).item()
+            if prob > Config.VAD_THRESHOLD:
+                speech = True
+        self._vad_rest = total - used
+        samples[:self._vad_rest] = samples[used:]
+        return speech
     
     def _init_audio(self):
         """Initialize PyAudio."""
         if self.audio is None:
+            _import_pyaudio()
             self.audio = pyaudio.PyAudio()
     
-    def start_recording(self):
-        """Start recording audio from microphone."""
-        self._init_audio()
+    def _create_stream(self):
+        """Open the microphone input stream in callback mode, stopped."""
+        return self.audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=Config.SAMPLE_RATE,
+            input=True,
+            frames_per_buffer=Config.CHUNK_SIZE,
+            start=False,
+            stream_callback=self._audio_callback
+        )
+    
+    def _open_stream(self) -> bool:
+        """
+        Make sure the microphone input stream is open and mark the session
+        as recording; notifies on failure.
         
-        try:
-            self.stream = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=Config.SAMPLE_RATE,
-                input=True,
-                frames_per_buffer=Config.CHUNK_SIZE
-            )
+        The stream is opened once and only started and stopped per session,
+        since opening it can take hundreds of milliseconds. It is closed in
+        cleanup().
+        """
+        if not self._wait_for_model():
+            return False
+        if self.stream is None:
+            self._init_audio()
+            try:
+                self.stream = self._create_stream()
+            except Exception as e:
+                Notifier.send("Speech-to-Text Error", f"Microphone error: {e}", "critical")
+                return False
+        
+        with self._session_lock:
+            if self.stop_requested.is_set():
+                return False  # Cancelled while waiting for the model
             self.is_recording = True
-            Notifier.send("Speech-to-Text", "🎤 Recording... Press hotkey to stop")
-            print("Recording started...")
+        return True
+    
+    def request_stop(self):
+        """Stop the current session, or cancel one still waiting to start."""
+        with self._session_lock:
+            self.stop_requested.set()
+            self.is_recording = False
+    
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """PortAudio callback: queue captured chunks until recording stops."""
+        if status & pyaudio.paInputOverflow:
+            self._overflows += 1
+        if not self.is_recording:
+            self._put_audio(None)  # Sentinel: no more audio
+            return (None, pyaudio.paComplete)
+        self._put_audio(in_data)
+        return (None, pyaudio.paContinue)
+    
+    def _put_audio(self, data):
+        """Hand a captured chunk to the consumer (PortAudio thread only)."""
+        self.audio_queue.append(data)
+        self._audio_event.set()
+    
+    def _get_audio(self):
+        """
+        Wait for and return the next captured chunk (consumer only).
+        
+        Returns None at the end of the stream. Normally that is the
+        callback's sentinel, but if the callback stops running (e.g. the
+        microphone was unplugged) the wait times out and None is returned
+        once the stream is inactive or a stop was requested.
+        """
+        while not self.audio_queue:
+            if not self._audio_event.wait(0.5):
+                if self.stream is None or not self.stream.is_active() or self.stop_requested.is_set():
+                    if not self.audio_queue:
+                        return None
+                continue
+            self._audio_event.clear()
+        return self.audio_queue.popleft()
+    
+    def _start_capture(self):
+        """
+        Start the stream in callback mode.
+        
+        PortAudio's own thread pushes each chunk into self.audio_queue while
+        the caller runs recognition, so slow AcceptWaveform calls never
+        overrun the input stream. Call _open_stream() first.
+        
+        If the device refuses to start, the stream is reopened and started
+        once more. Returns False, after notifying and clearing is_recording,
+        if that fails too.
+        """
+        self.audio_queue.clear()
+        self._audio_event.clear()
+        self._overflows = 0
+        for attempt in range(2):
+            try:
+                if self.stream is None:
+                    self.stream = self._create_stream()
+                self.stream.start_stream()
+                return True
+            except Exception as e:
+                error = e
+                # Drop the stream; the retry, or the next session, reopens it
+                if self.stream is not None:
+                    try:
+                        self.stream.close()
+                    except Exception:
+                        pass
+                    self.stream = None
+        
+        self.is_recording = False
+        Notifier.send("Speech-to-Text Error", f"Microphone error: {error}", "critical")
+        print(f"Error: could not start microphone: {error}")
+        return False
+    
+    def _stop_capture(self):
+        """
+        Stop the stream and discard any chunks still queued.
+        
+        The stream stays open for the next session; see _open_stream().
+        """
+        self.is_recording = False
+        self.audio_queue.clear()
+        self._report_overflows()
+        if self.stream is None:
+            return
+        try:
+            self.stream.stop_stream()
         except Exception as e:
-            Notifier.send("Speech-to-Text Error", f"Microphone error: {e}", "critical")
+            # Device went away mid-session: reopen on the next start
+            print(f"Warning: could not stop microphone stream: {e}")
+            try:
+                self.stream.close()
+            except Exception:
+                pass
+            self.stream = None
+    
+    def _announce_session(self, streaming: bool):
+        """Tell the user capture has started."""
+        if streaming:
+            Notifier.send("Speech-to-Text", "🎤 Streaming... Speak now!")
+            print("Streaming started... Press hotkey again to stop.")
+        else:
+            Notifier.send("Speech-to-Text", "🎤 Recording... Press hotkey to stop")
+            print("Recording started... Press hotkey again to stop.")
+    
+    @contextlib.contextmanager
+    def _audio_session(self, streaming: bool = False):
+        """
+        Run one capture session for the duration of a with block.
+        
+        Opens and starts the stream and announces the session, then yields
+        True; capture is stopped when the block exits, even if recognition
+        fails. Yields False if the session could not start (model failed to
+        load, microphone error, or stopped while waiting), in which case the
+        block should return straight away.
+        """
+        if not self._open_stream() or not self._start_capture():
+            yield False
+            return
+        self._announce_session(streaming)
+        try:
+            yield True
+        finally:
+            self._stop_capture()
+    
+    def _report_overflows(self):
+        """Warn if the input stream dropped audio during the session."""
+        if self._overflows:
+            print(f"Warning: microphone input overflowed {self._overflows} time(s); some audio was lost")
+    
+    def start_recording(self):
+        """Start recording audio from microphone."""
+        if not self._open_stream() or not self._start_capture():
             self.is_recording = False
+            return
+        
+        self._announce_session(streaming=False)
     
     def stop_recording_and_transcribe(self) -> str:
         """Stop recording and return transcribed text."""
@@ -413,78 +1393,77 @@ class SpeechRecognizer:
         
         self.is_recording = False
         
-        # Collect all audio data
-        audio_data = []
-        while self.stream and self.stream.is_active():
-            try:
-                data = self.stream.read(Config.CHUNK_SIZE, exception_on_overflow=False)
-                audio_data.append(data)
-            except:
-                break
-        
-        # Stop and close stream
-        if self.stream:
-            self.stream.stop_stream()
-            self.stream.close()
-            self.stream = None
+        pcm = self._collect_audio()
+        self._stop_capture()
         
         Notifier.send("Speech-to-Text", "⏳ Transcribing...")
         print("Transcribing...")
         
-        # Process audio through Vosk
-        for data in audio_data:
-            self.recognizer.AcceptWaveform(data)
+        return self._transcribe_pcm(pcm)
+    
+    def _collect_audio(self):
+        """
+        Drain queued audio up to the callback's end-of-stream sentinel.
         
-        result = json.loads(self.recognizer.FinalResult())
-        text = result.get("text", "")
+        Chunks are copied into one preallocated int16 array rather than
+        kept as a list of bytes objects; returns the filled part of it.
+        """
+        buf = np.empty(Config.SAMPLE_RATE * Config.MAX_RECORD_SECONDS, dtype=np.int16)
+        write_idx = 0
+        while True:
+            data = self._get_audio()
+            if data is None:
+                break
+            samples = np.frombuffer(data, dtype=np.int16)
+            if write_idx + len(samples) > len(buf):
+                buf = np.resize(buf, 2 * len(buf))
+            buf[write_idx:write_idx + len(samples)] = samples
+            write_idx += len(samples)
+        return buf[:write_idx]
+    
+    def _transcribe_pcm(self, pcm) -> str:
+        """Transcribe a complete 16-bit mono PCM recording."""
+        decoder, texts = self._open_final_decoder()
         
-        # Reset recognizer for next recording
-        self.recognizer = vosk.KaldiRecognizer(self.model, Config.SAMPLE_RATE)
+        # Process audio through Vosk in a single call
+        decoder.accept(pcm, partials=False)
+        decoder.finish()
         
-        return text
+        return " ".join(texts)
     
     def record_and_transcribe(self) -> str:
         """Record audio continuously and transcribe when stopped."""
-        self._init_audio()
-        
-        try:
-            self.stream = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=Config.SAMPLE_RATE,
-                input=True,
-                frames_per_buffer=Config.CHUNK_SIZE
-            )
-        except Exception as e:
-            Notifier.send("Speech-to-Text Error", f"Microphone error: {e}", "critical")
-            return ""
-        
-        self.is_recording = True
-        Notifier.send("Speech-to-Text", "🎤 Recording... Press hotkey to stop")
-        print("Recording started... Press hotkey again to stop.")
-        
-        # Record while is_recording is True
-        while self.is_recording:
-            try:
-                data = self.stream.read(Config.CHUNK_SIZE, exception_on_overflow=False)
-                self.recognizer.AcceptWaveform(data)
-            except Exception as e:
-                print(f"Audio error: {e}")
-                break
-        
-        # Stop stream
-        self.stream.stop_stream()
-        self.stream.close()
-        self.stream = None
+        # Recognize captured chunks until the callback signals the end,
+        # feeding Vosk BATCH_CHUNKS chunks per call to amortize its overhead
+        batch = bytearray(Config.BATCH_CHUNKS * Config.CHUNK_SIZE * 2)
+        view = memoryview(batch)
+        filled = 0
+        with self._audio_session() as started:
+            if not started:
+                return ""
+            decoder, texts = self._open_final_decoder()
+            while True:
+                data = self._get_audio()
+                try:
+                    if data is not None and filled + len(data) <= len(batch):
+                        view[filled:filled + len(data)] = data
+                        filled += len(data)
+                        continue
+                    # Batch full or end of audio: feed what has been gathered
+                    if filled:
+                        decoder.accept(view[:filled], partials=False)
+                    if data is None:
+                        break
+                    view[:len(data)] = data
+                    filled = len(data)
+                except Exception as e:
+                    print(f"Audio error: {e}")
+                    break
         
         # Get final result
-        result = json.loads(self.recognizer.FinalResult())
-        text = result.get("text", "")
-        
-        # Reset recognizer
-        self.recognizer = vosk.KaldiRecognizer(self.model, Config.SAMPLE_RATE)
+        decoder.finish()
         
-        return text
+        return " ".join(texts)
     
     def stream_and_transcribe(self, callback):
         """
@@ -494,62 +1473,47 @@ class SpeechRecognizer:
             - text: The transcribed text
             - is_final: True if this is a complete phrase, False for partial
         """
-        self._init_audio()
-        
-        try:
-            self.stream = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=Config.SAMPLE_RATE,
-                input=True,
-                frames_per_buffer=Config.CHUNK_SIZE
-            )
-        except Exception as e:
-            Notifier.send("Speech-to-Text Error", f"Microphone error: {e}", "critical")
-            return
-        
-        self.is_recording = True
-        Notifier.send("Speech-to-Text", "🎤 Streaming... Speak now!")
-        print("Streaming started... Press hotkey again to stop.")
-        
-        last_partial = ""
-        
-        while self.is_recording:
-            try:
-                data = self.stream.read(Config.CHUNK_SIZE, exception_on_overflow=False)
-                
-                if self.recognizer.AcceptWaveform(data):
-                    # Got a final result for a phrase
-                    result = json.loads(self.recognizer.Result())
-                    text = result.get("text", "")
-                    if text:
-                        callback(text, is_final=True)
-                        last_partial = ""
-                else:
-                    # Got a partial result
-                    partial = json.loads(self.recognizer.PartialResult())
-                    text = partial.get("partial", "")
-                    if text and text != last_partial:
-                        callback(text, is_final=False)
-                        last_partial = text
-                        
-            except Exception as e:
-                print(f"Streaming error: {e}")
-                break
+        silence = 0  # Samples of silence since the last speech chunk
+        silence_seconds = (
+            Config.ENERGY_VAD_SILENCE_SECONDS if self.vad_mode == "energy"
+            else Config.VAD_SILENCE_SECONDS
+        )
+        silence_limit = int(silence_seconds * Config.SAMPLE_RATE)
+        backlog_limit = int(Config.BACKLOG_SECONDS * Config.SAMPLE_RATE / Config.CHUNK_SIZE)
+        heard_speech = False
+        with self._audio_session(streaming=True) as started:
+            if not started:
+                return
+            decoder = self._open_decoder(callback)
+            if self.vad is not None:
+                self.vad.reset_states()
+            self._vad_rest = 0
+            while True:
+                data = self._get_audio()
+                if data is None:
+                    break
+                try:
+                    # One int16 view of the chunk serves both the VAD and the decoder
+                    pcm = np.frombuffer(data, dtype=np.int16)
+                    if self.vad_mode is not None and not self._is_speech(pcm):
+                        # Skip silence; flush the utterance once it has gone quiet
+                        silence += len(pcm)
+                        if heard_speech and silence >= silence_limit:
+                            decoder.flush()
+                            heard_speech = False
+                        continue
+                    silence = 0
+                    heard_speech = True
+                    
+                    # Skip partials while recognition is behind real time
+                    decoder.accept(pcm, partials=len(self.audio_queue) < backlog_limit)
+                    
+                except Exception as e:
+                    print(f"Streaming error: {e}")
+                    break
         
         # Get any remaining final result
-        result = json.loads(self.recognizer.FinalResult())
-        text = result.get("text", "")
-        if text:
-            callback(text, is_final=True)
-        
-        # Cleanup
-        self.stream.stop_stream()
-        self.stream.close()
-        self.stream = None
-        
-        # Reset recognizer
-        self.recognizer = vosk.KaldiRecognizer(self.model, Config.SAMPLE_RATE)
+        decoder.finish()
     
     def cleanup(self):
         """Clean up audio resources."""
@@ -558,6 +1522,110 @@ class SpeechRecognizer:
             self.stream.close()
         if self.audio:
             self.audio.terminate()
+        if self.worker is not None:
+            self.worker.terminate()
+
+
+class WhisperRecognizer(SpeechRecognizer):
+    """Handle speech recognition using faster-whisper (CTranslate2, INT8)."""
+    
+    WINDOW_STEP = 0.4  # Seconds of new audio between streaming re-transcriptions
+    WINDOW_OVERLAP = 0.05  # Seconds of audio carried into the next phrase
+    MAX_BUFFER_DURATION = 10.0  # Seconds of audio before a phrase is forced final
+    
+    def _check_model(self):
+        """Exit early if faster-whisper is missing."""
+        if importlib.util.find_spec("faster_whisper") is None:
+            print("Error: faster-whisper not installed. Run: pip install faster-whisper")
+            sys.exit(1)
+    
+    def _load_model(self):
+        """Load the Whisper model with INT8 weights."""
+        from faster_whisper import WhisperModel
+        
+        self.model = WhisperModel(
+            Config.get_whisper_model(),
+            device="cpu",
+            compute_type="int8"
+        )
+    
+    def _transcribe(self, audio) -> str:
+        """Transcribe float32 audio in [-1, 1]."""
+        segments, _ = self.model.transcribe(audio, beam_size=1, vad_filter=True)
+        return " ".join(segment.text.strip() for segment in segments).strip()
+    
+    def _transcribe_pcm(self, pcm) -> str:
+        """Transcribe a complete 16-bit mono PCM recording."""
+        audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        return self._transcribe(audio)
+    
+    def record_and_transcribe(self) -> str:
+        """Record audio continuously and transcribe when stopped."""
+        with self._audio_session() as started:
+            if not started:
+                return ""
+            pcm = self._collect_audio()
+        
+        if not len(pcm):
+            return ""
+        return self._transcribe_pcm(pcm)
+    
+    def stream_and_transcribe(self, callback):
+        """
+        Stream audio and call callback with partial/final results.
+        
+        The current phrase is kept in a float32 buffer and re-transcribed
+        every WINDOW_STEP seconds as a partial. Once it reaches
+        MAX_BUFFER_DURATION it is emitted as final and a new phrase starts
+        with WINDOW_OVERLAP seconds of the old audio.
+        """
+        step = int(self.WINDOW_STEP * Config.SAMPLE_RATE)
+        backlog_limit = int(Config.BACKLOG_SECONDS * Config.SAMPLE_RATE / Config.CHUNK_SIZE)
+        overlap = int(self.WINDOW_OVERLAP * Config.SAMPLE_RATE)
+        window = np.empty(int(self.MAX_BUFFER_DURATION * Config.SAMPLE_RATE), dtype=np.float32)
+        filled = 0
+        pending = 0
+        last_partial = ""
+        with self._audio_session(streaming=True) as started:
+            if not started:
+                return
+            while True:
+                data = self._get_audio()
+                if data is None:
+                    break
+                try:
+                    samples = np.frombuffer(data, dtype=np.int16)
+                    if filled + len(samples) > len(window):
+                        # Phrase buffer is full: commit it and keep a short overlap
+                        text = self._transcribe(window[:filled])
+                        if text:
+                            callback(text, is_final=True)
+                        window[:overlap] = window[filled - overlap:filled]
+                        filled = overlap
+                        pending = 0
+                        last_partial = ""
+                    
+                    window[filled:filled + len(samples)] = samples / 32768.0
+                    filled += len(samples)
+                    pending += len(samples)
+                    
+                    # Skip partials while transcription is behind real time;
+                    # the phrase is still committed when the buffer fills
+                    if pending >= step and len(self.audio_queue) < backlog_limit:
+                        pending = 0
+                        text = self._transcribe(window[:filled])
+                        if text and text != last_partial:
+                            callback(text, is_final=False)
+                            last_partial = text
+                
+                except Exception as e:
+                    print(f"Streaming error: {e}")
+                    break
+        
+        # Commit whatever is left of the current phrase
+        text = self._transcribe(window[:filled]) if filled else ""
+        if text:
+            callback(text, is_final=True)
 
 
 
@@ -565,42 +1633,230 @@ class SpeechToTextApp:
     """Main application class."""
     
     def __init__(self):
-        self.recognizer = SpeechRecognizer()
+        if Config.get_engine() == "whisper":
+            self.recognizer = WhisperRecognizer()
+        else:
+            self.recognizer = SpeechRecognizer()
         self.typer = TextTyper()
-        self.current_keys = set()
+        # Hotkey keys map to one bit each; pressed hotkey keys are tracked
+        # as a bitmask so each key event is a dict lookup and an int compare.
+        self._key_bits = {}
+        self._target_mask = None  # Set in run()
+        self._pressed_mask = 0
         self.recording_thread = None
         self.hotkey_pressed = False
+        # Partial results are debounced before typing (see _on_transcription)
+        self._typing_lock = threading.Lock()
+        self._pending_partial = None
+        self._partial_timer = None
     
-    def _on_press(self, key):
-        """Handle key press events."""
-        self.current_keys.add(key)
+    def _set_hotkey(self, hotkey):
+        """Assign a bit to each key of the hotkey combination."""
+        self._key_bits = {key: 1 << i for i, key in enumerate(hotkey)}
+        self._target_mask = (1 << len(self._key_bits)) - 1
+        self._pressed_mask = 0
+    
+    def _press_bit(self, bit):
+        """Record a hotkey key press and toggle when the combination is complete."""
+        self._pressed_mask |= bit
         
         # Check if hotkey combination is pressed
-        hotkey = Config.get_hotkey()
-        if hotkey.issubset(self.current_keys):
+        if self._pressed_mask == self._target_mask:
             if not self.hotkey_pressed:
                 self.hotkey_pressed = True
                 self._toggle_recording()
     
-    def _on_release(self, key):
-        """Handle key release events."""
-        try:
-            self.current_keys.discard(key)
-        except KeyError:
-            pass
+    def _release_bit(self, bit):
+        """Record a hotkey key release."""
+        self._pressed_mask &= ~bit
         
         # Reset hotkey state when any key in the combo is released
-        hotkey = Config.get_hotkey()
-        if not hotkey.issubset(self.current_keys):
+        if self._pressed_mask != self._target_mask:
             self.hotkey_pressed = False
     
+    def _on_press(self, key):
+        """Handle pynput key press events."""
+        self._press_bit(self._key_bits.get(key, 0))
+    
+    def _on_release(self, key):
+        """Handle pynput key release events."""
+        self._release_bit(self._key_bits.get(key, 0))
+    
+    def _listen_evdev(self) -> bool:
+        """
+        Watch keyboard devices through evdev until interrupted.
+        
+        Key events are read straight from /dev/input instead of going through
+        a pynput callback for every keystroke on the display server.
+        Returns False if evdev cannot be used (not installed, a hotkey key
+        without an evdev code, or no readable keyboard device - reading
+        requires root or membership of the input group), in which case the
+        caller falls back to pynput. Keyboards attached later, including
+        Bluetooth keyboards reconnecting under a new event node, are picked
+        up by a rescan every EVDEV_RESCAN_SECONDS.
+        """
+        try:
+            import evdev
+        except ImportError:
+            return False
+        
+        code_bits = {}
+        for key, bit in self._key_bits.items():
+            names = evdev_key_names(key)
+            if not names:
+                return False
+            for name in names:
+                code = evdev.ecodes.ecodes.get(name)
+                if code is None:
+                    return False
+                code_bits[code] = bit
+        
+        selector = selectors.DefaultSelector()
+        watched = {}  # Real device path -> InputDevice
+        
+        def rescan():
+            """Start watching keyboards that appeared since the last scan."""
+            paths = glob.glob("/dev/input/by-id/*-event-kbd") + glob.glob("/dev/input/by-path/*-event-kbd")
+            for path in {os.path.realpath(p) for p in paths} - watched.keys():
+                try:
+                    device = evdev.InputDevice(path)
+                except OSError:
+                    continue
+                selector.register(device, selectors.EVENT_READ)
+                watched[path] = device
+        
+        rescan()
+        if not watched:
+            selector.close()
+            return False
+        
+        next_scan = time.monotonic() + Config.EVDEV_RESCAN_SECONDS
+        try:
+            while True:
+                for sel_key, _ in selector.select(timeout=Config.EVDEV_RESCAN_SECONDS):
+                    device = sel_key.fileobj
+                    try:
+                        events = list(device.read())
+                    except OSError:
+                        # Device unplugged; a later rescan picks it up again
+                        selector.unregister(device)
+                        device.close()
+                        watched.pop(device.path, None)
+                        continue
+                    for event in events:
+                        if event.type != evdev.ecodes.EV_KEY:
+                            continue
+                        bit = code_bits.get(event.code)
+                        if bit is None:
+                            continue
+                        if event.value:  # 1 = press, 2 = autorepeat
+                            self._press_bit(bit)
+                        else:
+                            self._release_bit(bit)
+                
+                if time.monotonic() >= next_scan:
+                    rescan()
+                    next_scan = time.monotonic() + Config.EVDEV_RESCAN_SECONDS
+        finally:
+            for device in watched.values():
+                device.close()
+            selector.close()
+    
+    def _listen_portal(self) -> bool:
+        """
+        Register the hotkey with the XDG GlobalShortcuts portal and wait for it.
+        
+        The compositor watches the keyboard and only signals this process
+        when the shortcut fires, so ordinary typing never wakes it. Wayland
+        only; returns False if dbus-next or the portal is unavailable, or
+        the user declines the shortcut.
+        """
+        if Config.DISPLAY_SERVER != "wayland":
+            return False
+        if importlib.util.find_spec("dbus_next") is None:
+            return False
+        return asyncio.run(self._portal_session())
+    
+    async def _portal_session(self) -> bool:
+        """Bind the hotkey through the portal and serve activations until interrupted."""
+        from dbus_next import Message, Variant
+        from dbus_next.aio import MessageBus
+        
+        portal = "org.freedesktop.portal.Desktop"
+        path = "/org/freedesktop/portal/desktop"
+        try:
+            bus = await MessageBus().connect()
+            introspection = await bus.introspect(portal, path)
+            shortcuts = bus.get_proxy_object(portal, path, introspection).get_interface(
+                "org.freedesktop.portal.GlobalShortcuts"
+            )
+        except Exception:
+            return False
+        
+        sender = bus.unique_name[1:].replace(".", "_")
+        
+        async def request(call, token, *args, **options):
+            """Call a portal method and wait for its Request.Response signal."""
+            request_path = f"{path}/request/{sender}/{token}"
+            response = asyncio.get_running_loop().create_future()
+            
+            def on_message(message):
+                if message.path == request_path and message.member == "Response" and not response.done():
+                    response.set_result(message.body)
+            
+            # Subscribe before calling so the response cannot be missed
+            bus.add_message_handler(on_message)
+            await bus.call(Message(
+                destination="org.freedesktop.DBus",
+                path="/org/freedesktop/DBus",
+                interface="org.freedesktop.DBus",
+                member="AddMatch",
+                signature="s",
+                body=[f"type='signal',interface='org.freedesktop.portal.Request',path='{request_path}'"],
+            ))
+            options = {name: Variant("s", value) for name, value in options.items()}
+            options["handle_token"] = Variant("s", token)
+            await call(*args, options)
+            code, results = await response
+            bus.remove_message_handler(on_message)
+            return code, results
+        
+        try:
+            code, results = await request(
+                shortcuts.call_create_session, "stt_session",
+                session_handle_token="stt",
+            )
+            if code != 0:
+                return False
+            session = results["session_handle"].value
+            
+            code, _ = await request(
+                shortcuts.call_bind_shortcuts, "stt_bind",
+                session,
+                [["toggle-recording", {
+                    "description": Variant("s", "Start/stop speech-to-text"),
+                    "preferred_trigger": Variant("s", portal_trigger(Config.get_hotkey())),
+                }]],
+                "",
+            )
+            if code != 0:
+                return False
+        except Exception:
+            return False
+        
+        shortcuts.on_activated(lambda *args: self._toggle_recording())
+        await asyncio.Future()  # Serve activations until interrupted
+    
     def _toggle_recording(self):
         """Toggle recording state."""
-        if self.recognizer.is_recording:
-            # Stop recording
-            self.recognizer.is_recording = False
+        if self.recording_thread is not None and self.recording_thread.is_alive():
+            # Stop recording, or cancel a session still waiting for the model
+            if self.recognizer.stop_requested.is_set():
+                print("Still finishing the previous recording...")
+            self.recognizer.request_stop()
         else:
             # Start recording in a separate thread
+            self.recognizer.stop_requested.clear()
             if Config.get_streaming_mode():
                 self.recording_thread = threading.Thread(target=self._stream_and_type)
             else:
@@ -612,10 +1868,24 @@ class SpeechToTextApp:
         if Config.get_incremental_typing():
             if is_final:
                 print(f"  [FINAL] {text}")
-                self.typer.type_incremental(text, is_final=True)
+                with self._typing_lock:
+                    # The final supersedes any partial still waiting to be typed
+                    if self._partial_timer is not None:
+                        self._partial_timer.cancel()
+                        self._partial_timer = None
+                    self._pending_partial = None
+                    self.typer.type_incremental(text, is_final=True)
             else:
                 print(f"  [partial] {text}")
-                self.typer.type_incremental(text, is_final=False)
+                # Debounce: type only the latest partial once per streaming interval
+                with self._typing_lock:
+                    self._pending_partial = text
+                    if self._partial_timer is None:
+                        self._partial_timer = threading.Timer(
+                            Config.get_streaming_interval(), self._flush_partial
+                        )
+                        self._partial_timer.daemon = True
+                        self._partial_timer.start()
         else:
             if is_final:
                 print(f"  [FINAL] {text}")
@@ -623,6 +1893,15 @@ class SpeechToTextApp:
             else:
                 print(f"  [partial] {text}") # Still print partials for feedback, but don't type
     
+    def _flush_partial(self):
+        """Type the most recent partial result (runs on the debounce timer)."""
+        with self._typing_lock:
+            text = self._pending_partial
+            self._pending_partial = None
+            self._partial_timer = None
+            if text:
+                self.typer.type_incremental(text, is_final=False)
+    
     def _stream_and_type(self):
         """Stream audio, transcribe, and type results in real-time."""
         self.typer.reset_incremental()
@@ -648,6 +1927,7 @@ class SpeechToTextApp:
         
         # Load config first
         Config.load()
+        self._set_hotkey(Config.get_hotkey())
         
         mode_str = "STREAMING (real-time)" if Config.get_streaming_mode() else "BATCH (after recording)"
         incremental_typing_str = "ENABLED" if Config.get_incremental_typing() else "DISABLED (type final only)"
@@ -658,7 +1938,7 @@ class SpeechToTextApp:
             print("=" * 50)
             print("Speech-to-Text Application")
             print("=" * 50)
-            print(f"Display Server: {Config.get_display_server()}")
+            print(f"Display Server: {Config.DISPLAY_SERVER}")
             print(f"Mode: {mode_str}")
             print(f"Incremental Typing: {incremental_typing_str}")
             print(f"Hotkey: {hotkey_str}")
@@ -672,11 +1952,12 @@ class SpeechToTextApp:
         Notifier.send("Speech-to-Text", f"Ready! Press {hotkey_str}")
         
         try:
-            with keyboard.Listener(
-                on_press=self._on_press,
-                on_release=self._on_release
-            ) as listener:
-                listener.join()
+            if not self._listen_portal() and not self._listen_evdev():
+                with keyboard.Listener(
+                    on_press=self._on_press,
+                    on_release=self._on_release
+                ) as listener:
+                    listener.join()
         except KeyboardInterrupt:
             if not DAEMON_MODE:
                 print("\nExiting...")